@@ -8,123 +8,389 @@ Hilo 3 - Muestra una gráfica simple y una descripción en una ventana Tkinter.
 
 import threading   
 import time
-import random
-import csv
+import functools
 import os
-from collections import deque
+import sysconfig
 from datetime import datetime
 
 import tkinter as tk
 
-
+import numpy as np
+
+try:
+	import liburing # Envío de escrituras por lotes con io_uring (opcional, solo Linux)
+except ImportError:
+	liburing = None
+else:
+	# La ruta uring está escrita contra liburing 2024.4.22 (ver
+	# requirements.txt); otras versiones del binding cambian el API del
+	# anillo, así que ante una superficie distinta se usa la ruta stdlib
+	if not all(hasattr(liburing, nombre) for nombre in (
+			'io_uring', 'io_uring_queue_init', 'io_uring_queue_exit',
+			'io_uring_get_sqe', 'iovec', 'io_uring_prep_write_fixed',
+			'io_uring_register_files', 'io_uring_register_buffers',
+			'io_uring_submit', 'io_uring_wait_cqe', 'io_uring_cqe',
+			'io_uring_cqe_seen', 'trap_error')):
+		liburing = None
+
+USAR_URING = True # Permite forzar la ruta stdlib aunque liburing esté instalado
+
+try:
+	from PIL import Image, ImageDraw, ImageTk # Backend raster para la gráfica (opcional)
+except ImportError:
+	Image = None
+
+USAR_RASTER = True # Permite forzar los items de Canvas aunque PIL esté instalado
+
+try:
+	from numba import njit # Compila los kernels numéricos a código nativo (opcional)
+except ImportError:
+	njit = None
+
+
+def _paso_generador(temperatura, humedad, presion, d_temp, d_hum, d_pres):
+	"""Avanza la caminata aleatoria un paso y aplica los límites físicos."""
+	temperatura = max(-50.0, min(60.0, temperatura + d_temp))
+	humedad = max(0.0, min(100.0, humedad + d_hum))
+	presion = max(300.0, min(1100.0, presion + d_pres))
+	return temperatura, humedad, presion
+
+
+def _calcular_xy(series, ancho, alto, miny, maxy, pts):
+	"""Rellena pts con pares x,y intercalados, listos para canvas.coords()."""
+	n = series.shape[0]
+	paso = (ancho - 60.0) / (n - 1)
+	escala = (alto - 60.0) / (maxy - miny)
+	for i in range(n):
+		pts[2 * i] = i * paso + 30.0
+		pts[2 * i + 1] = alto - 30.0 - (series[i] - miny) * escala
+
+
+def _rango_dinamico(values, default_range, margin_frac=0.1):
+	if len(values) == 0:
+		return default_range
+	mn = values.min() # min/max a velocidad C sobre el array
+	mx = values.max()
+	if mn == mx:
+		mn -= 1
+		mx += 1
+	rng = mx - mn
+	mn -= rng * margin_frac
+	mx += rng * margin_frac
+	return (mn, mx)
+
+
+if njit is not None: # Con numba los bucles escalares corren como código nativo
+	_paso_generador = njit(cache=True)(_paso_generador)
+	_calcular_xy = njit(cache=True)(_calcular_xy)
+else: # Sin numba, las coordenadas conservan la versión vectorizada con numpy
+	def _calcular_xy(series, ancho, alto, miny, maxy, pts):
+		n = series.shape[0]
+		pts[0::2] = np.arange(n, dtype=np.float64) * ((ancho - 60.0) / (n - 1)) + 30.0
+		pts[1::2] = alto - 30.0 - ((series - miny) * ((alto - 60.0) / (maxy - miny)))
+
+
+
+
+# Hay un solo productor (generador) y lectores que solo consultan. El
+# invariante real no es atomicidad del anillo completo sino "publicar al
+# final": _agregar escribe las cuatro celdas y recién después incrementa
+# 'cursor', así que ningún lector indexa una celda a medio escribir vía el
+# cursor. La carrera restante es que, con el anillo lleno, el productor
+# sobreescribe la celda más vieja mientras _historial copia los arrays;
+# _historial relee el cursor al final y descarta del frente las celdas que
+# pudieron quedar rotas. En la build free-threaded (PEP 703) el GIL ni
+# siquiera serializa los bytecodes y el lock vuelve.
+_USAR_LOCK = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
 
 
 def crear_compartido(maxlen=300):
-	return {
-		'lock': threading.Lock(), # Crea un controlador de acceso	
-		'history': deque(maxlen=maxlen), # Almacena los datos de las muestras
+	# Historial en columnas (SoA): un array por serie más un cursor de anillo,
+	# en lugar de un deque de tuplas. Evita desempaquetar/boxear en cada frame.
+	compartido = {
+		'maxlen': maxlen,
+		'ts': np.empty(maxlen, dtype='datetime64[us]'), # Timestamps de las muestras
+		'temp': np.empty(maxlen, dtype=np.float64), # Temperatura (°C)
+		'hum': np.empty(maxlen, dtype=np.float64), # Humedad (%)
+		'pres': np.empty(maxlen, dtype=np.float64), # Presión (hPa)
+		'cursor': 0, # Próxima posición de escritura (siempre creciente, se indexa módulo maxlen)
+		'count': 0, # Muestras válidas (satura en maxlen)
+	}
+	if _USAR_LOCK: # Solo necesario sin GIL
+		compartido['lock'] = threading.Lock()
+	return compartido
+
+
+def _agregar(compartido, muestra):
+	i = compartido['cursor'] % compartido['maxlen']
+	ts, temperatura, humedad, presion = muestra
+	compartido['ts'][i] = np.datetime64(ts)
+	compartido['temp'][i] = temperatura
+	compartido['hum'][i] = humedad
+	compartido['pres'][i] = presion
+	# Publica la muestra al final: los lectores solo ven celdas ya escritas
+	compartido['cursor'] += 1
+	if compartido['count'] < compartido['maxlen']:
+		compartido['count'] += 1
+
+
+def _ultima(compartido):
+	if compartido['count'] == 0:
+		return None
+	i = (compartido['cursor'] - 1) % compartido['maxlen']
+	return (compartido['ts'][i].item(), float(compartido['temp'][i]),
+		float(compartido['hum'][i]), float(compartido['pres'][i]))
+
+
+def _historial(compartido):
+	cursor_ini = compartido['cursor']
+	n = compartido['count']
+	maxlen = compartido['maxlen']
+	if n < maxlen: # El anillo aún no dio la vuelta: orden natural
+		# El productor solo añade celdas nuevas al final; las primeras n
+		# son estables y la copia no corre ningún riesgo
+		return {
+			'ts': compartido['ts'][:n].copy(),
+			'temp': compartido['temp'][:n].copy(),
+			'hum': compartido['hum'][:n].copy(),
+			'pres': compartido['pres'][:n].copy(),
+		}
+	# Anillo lleno: reordena para entregar las series en orden cronológico
+	inicio = cursor_ini % maxlen
+	corte = lambda arr: np.concatenate((arr[inicio:], arr[:inicio]))
+	snapshot = {
+		'ts': corte(compartido['ts']),
+		'temp': corte(compartido['temp']),
+		'hum': corte(compartido['hum']),
+		'pres': corte(compartido['pres']),
 	}
+	# Si el productor avanzó durante la copia pudo sobreescribir las celdas
+	# más viejas: se descartan del frente para no entregar una muestra rota
+	# (p. ej. temp nueva emparejada con ts viejo)
+	avance = min(compartido['cursor'] - cursor_ini, maxlen)
+	if avance:
+		snapshot = {clave: arr[avance:] for clave, arr in snapshot.items()}
+	return snapshot
 
 
-def agregar_muestra(compartido, muestra): 
-	with compartido['lock']: # Abre la seccion 
-		compartido['history'].append(muestra) # Agrega la muestra al historial
- 
+def agregar_muestra(compartido, muestra):
+	lock = compartido.get('lock')
+	if lock is not None:
+		with lock:
+			_agregar(compartido, muestra)
+		return
+	_agregar(compartido, muestra) # Agrega la muestra al historial
 
-def ultima(compartido): 
-	with compartido['lock']:
-		if compartido['history']: 
-			return compartido['history'][-1] # Devuelve la ultima muestra si hay
-		return None
+
+def ultima(compartido):
+	lock = compartido.get('lock')
+	if lock is not None:
+		with lock:
+			return _ultima(compartido)
+	return _ultima(compartido) # Devuelve la ultima muestra si hay
 
 
 def obtener_historial(compartido):
-	with compartido['lock']:
-		return list(compartido['history']) # Devuelve una copia del historial
+	lock = compartido.get('lock')
+	if lock is not None:
+		with lock:
+			return _historial(compartido)
+	return _historial(compartido) # Devuelve una copia del historial por serie
 
 
 def hilo_generador(compartido, evento_parada: threading.Event):
 	"""Genera muestras cada segundo con pequeñas variaciones."""
+	rng = np.random.default_rng() # Un solo llamado C produce los tres valores por tick
 	# Valores base (primeros) randomizados
-	temperatura = random.uniform(15.0, 25.0)  # Celsius 
-	humedad = random.uniform(40.0, 60.0)   # %
-	presion = random.uniform(1000.0, 1025.0)  # hPa
-
-	while not evento_parada.is_set(): # Bucle hasta que se indique parada
-		# Variaciones pequeñas aleatorias
-		temperatura += random.uniform(-0.5, 0.5)
-		humedad += random.uniform(-1.0, 1.0)
-		presion += random.uniform(-0.8, 0.8)
+	temperatura, humedad, presion = rng.uniform(
+		low=(15.0, 40.0, 1000.0), high=(25.0, 60.0, 1025.0))  # Celsius, %, hPa
 
-		temperatura = max(-50.0, min(60.0, temperatura))
-		humedad = max(0.0, min(100.0, humedad))
-		presion = max(300.0, min(1100.0, presion))
+	proxima = time.monotonic() # Plazo absoluto: el periodo no acumula la deriva del cuerpo
+	while True: # El wait() del final corta el bucle cuando se indica parada
+		# Variaciones pequeñas aleatorias, paso y límites en el kernel nativo
+		d_temp, d_hum, d_pres = rng.uniform(
+			low=(-0.5, -1.0, -0.8), high=(0.5, 1.0, 0.8))
+		temperatura, humedad, presion = _paso_generador(
+			temperatura, humedad, presion, d_temp, d_hum, d_pres)
 
 		ahora = datetime.now() # Timestamp actual
 		muestra = (ahora, round(temperatura, 2), round(humedad, 2), round(presion, 2))
 		agregar_muestra(compartido, muestra) # Agrega la muestra al compartido
 
-		time.sleep(1)
+		proxima += 1.0
+		restante = proxima - time.monotonic()
+		# Mismo futex que usa el registrador: sin sondeo, y despierta
+		# al instante cuando llega la señal de parada
+		if evento_parada.wait(max(0.0, restante)):
+			break
+
+
+CABECERA_CSV = "datetime,temperatura_C,humedad_percent,presion_hPa" # Cabecera CSV
+
+def _codificar_fila(muestra):
+	ts, temperatura, humedad, presion = muestra # Desempaqueta la muestra
+	return f"{ts.isoformat(sep=' ')},{temperatura},{humedad},{presion}\r\n".encode("ascii")
+
+
+TAM_BUF_URING = 64 * 1024 # Buffer fijo registrado en el kernel
+
+# Valor ABI estable de io_uring; el binding 2024.4.22 no exporta la constante
+IOSQE_FIXED_FILE = 1 << 0
+
+
+def _registrador_uring(compartido, ruta_csv, evento_parada):
+	"""Variante io_uring: fd y buffer registrados, lotes con write_fixed.
+
+	Escrita y probada contra liburing 2024.4.22. En ese binding
+	io_uring_queue_init_params no es usable (y con él SQPOLL), así que el
+	anillo se crea sin flags; quedan el fd fijo y el buffer registrado.
+	"""
+	escribir_cabecera = not os.path.exists(ruta_csv)
+	fd = os.open(ruta_csv, os.O_WRONLY | os.O_CREAT, 0o644)
+	ring = liburing.io_uring()
+	try:
+		liburing.io_uring_queue_init(64, ring, 0)
+	except Exception:
+		os.close(fd)
+		raise
+	try:
+		buf = bytearray(TAM_BUF_URING)
+		iov = liburing.iovec(buf)
+		liburing.io_uring_register_files(ring, [fd]) # fd por índice: sin lookup por E/S
+		liburing.io_uring_register_buffers(ring, iov, 1) # Fija las páginas una sola vez
+		offset = os.fstat(fd).st_size # Posición de escritura llevada desde Python
+		pendiente = 0 # Bytes acumulados en el buffer registrado
+		cqe = liburing.io_uring_cqe()
+
+		def acumular(datos):
+			nonlocal pendiente
+			buf[pendiente:pendiente + len(datos)] = datos
+			pendiente += len(datos)
+
+		def enviar():
+			# Colapsa todo lo acumulado en un solo write_fixed encolado al anillo
+			nonlocal offset, pendiente
+			while pendiente:
+				sqe = liburing.io_uring_get_sqe(ring)
+				liburing.io_uring_prep_write_fixed(sqe, 0, iov.iov_base, pendiente, offset, 0)
+				sqe.flags = IOSQE_FIXED_FILE # Índice 0 de los fds registrados
+				liburing.io_uring_submit(ring)
+				liburing.io_uring_wait_cqe(ring, cqe)
+				escrito = liburing.trap_error(cqe.res) # Eleva OSError si res < 0
+				liburing.io_uring_cqe_seen(ring, cqe)
+				offset += escrito
+				if escrito < pendiente: # Escritura corta: corre el resto al inicio
+					buf[:pendiente - escrito] = buf[escrito:pendiente]
+				pendiente -= escrito
+
+		if escribir_cabecera:
+			acumular((CABECERA_CSV + "\r\n").encode("ascii"))
+		# Escribe la primera muestra inmediatamente si existe
+		primera = ultima(compartido)
+		if primera is not None:
+			acumular(_codificar_fila(primera))
+		enviar()
+		while not evento_parada.wait(5): # Espera 5 segundos o hasta que se indique parada
+			muestra = ultima(compartido)
+			if muestra is None: # Si no hay muestra, continuar
+				continue
+			acumular(_codificar_fila(muestra))
+			enviar() # Cierra el lote acumulado: un io_uring_enter por tick
+	finally:
+		liburing.io_uring_queue_exit(ring)
+		os.close(fd)
+
+
+TICKS_POR_FLUSH = 6 # El buffer se vuelca al kernel cada ~30 s (y siempre al cerrar)
+
+
+def _registrador_stdlib(compartido, ruta_csv, evento_parada):
+	"""Variante stdlib: archivo binario con buffer grande, filas preformateadas."""
+	escribir_cabecera = not os.path.exists(ruta_csv) # Si el archivo no existe, escribir cabecera
+	# Modo binario con buffer de 64 KiB: las filas se acumulan en el
+	# BufferedWriter y llegan al kernel en bloques, no una syscall por fila
+	f = open(ruta_csv, "ab", buffering=64 * 1024)
+	try:
+		lineas = []
+		if escribir_cabecera: # Si es necesario, encola la cabecera
+			lineas.append((CABECERA_CSV + "\r\n").encode("ascii"))
+
+		# Escribe la primera muestra inmediatamente si existe
+		primera = ultima(compartido)
+		if primera is not None: # Si hay una muestra
+			lineas.append(_codificar_fila(primera))
+		if lineas:
+			f.writelines(lineas)
+			lineas.clear()
+			f.flush() # El primer registro queda visible de inmediato
+
+		ticks_sin_flush = 0
+		while not evento_parada.wait(5): # Espera 5 segundos o hasta que se indique parada
+			# Escribe la última muestra
+			muestra = ultima(compartido)
+			if muestra is None: # Si no hay muestra, continuar
+				continue
+			lineas.append(_codificar_fila(muestra))
+			f.writelines(lineas) # Queda en el buffer de 64 KiB
+			lineas.clear()
+			ticks_sin_flush += 1
+			if ticks_sin_flush >= TICKS_POR_FLUSH:
+				f.flush()
+				ticks_sin_flush = 0
+	finally:
+		f.close() # Vuelca lo pendiente y cierra el archivo
 
 
 def hilo_registrador(compartido, ruta_csv: str, evento_parada: threading.Event):
 	dirname = os.path.dirname(ruta_csv) # Ruta del csv
 	if dirname and not os.path.exists(dirname):# Crea el directorio si no existe
-        
+
 		os.makedirs(dirname, exist_ok=True) # Crea el directorio
 
-	header = ["datetime", "temperatura_C", "humedad_percent", "presion_hPa"] # Cabecera CSV
+	if USAR_URING and liburing is not None: # Usa io_uring si el binding está disponible
+		try:
+			_registrador_uring(compartido, ruta_csv, evento_parada)
+			return
+		except Exception:
+			# EPERM/ENOSYS en contenedores o kernels viejos, binding
+			# incompatible, etc.: un fallo del anillo no puede matar el
+			# hilo y dejar la simulación sin registro en CSV
+			pass
+	_registrador_stdlib(compartido, ruta_csv, evento_parada) # Ruta stdlib equivalente
 
-	escribir_cabecera = not os.path.exists(ruta_csv) # Si el archivo no existe, escribir cabecera
-	# Escribe la primera muestra inmediatamente si existe
-	primera = ultima(compartido)
-	if primera is not None: # Si hay una muestra
-		with open(ruta_csv, "a", newline="") as f: # Abre el archivo en modo append
-			writer = csv.writer(f) # Crea el escritor CSV
-			if escribir_cabecera: # Si es necesario, escribe la cabecera
-				writer.writerow(header) # Escribe la cabecera
-				escribir_cabecera = False # Marca que ya se escribió
-			ts, temperatura, humedad, presion = primera # Desempaqueta la muestra
-			writer.writerow([ts.isoformat(sep=" "), temperatura, humedad, presion]) # Escribe la muestra
-	while not evento_parada.wait(5): # Espera 5 segundos o hasta que se indique parada
-		# Escribe la última muestra
-		muestra = ultima(compartido)
-		if muestra is None: # Si no hay muestra, continuar
-			continue
-		with open(ruta_csv, "a", newline="") as f: # Abre el archivo en modo append
-			writer = csv.writer(f) # Crea el escritor CSV
-			if escribir_cabecera: # Si es necesario, escribe la cabecera
-				writer.writerow(header) # Escribe la cabecera
-				escribir_cabecera = False # Marca que ya se escribió
-			ts, temperatura, humedad, presion = muestra # Desempaqueta la muestra
-			writer.writerow([ts.isoformat(sep=" "), temperatura, humedad, presion]) # Escribe la muestra
-
-
-def describe_trend(history):
-	"""Genera una descripción simple basada en los últimos puntos."""
-	if len(history) < 2:
-		return "Recopilando datos..."
 
-	# usar los últimos 3 puntos si existen
-	last = history[-1]
-	prev = history[-2]
+@functools.lru_cache(maxsize=256)
+def _tendencia(a, b, tol):
+	if b - a > tol:
+		return "subiendo"
+	if a - b > tol:
+		return "bajando"
+	return "estable"
 
-	_, t1, h1, p1 = prev
-	_, t2, h2, p2 = last
 
-	def trend(a, b, tol):
-		if b - a > tol:
-			return "subiendo"
-		if a - b > tol:
-			return "bajando"
-		return "estable"
+@functools.lru_cache(maxsize=64)
+def _texto_tendencia(t_tr, h_tr, p_tr, t2, h2, p2):
+	return f"Temperatura {t_tr} ({t2} °C), humedad {h_tr} ({h2} %), presión {p_tr} ({p2} hPa)."
 
-	t_tr = trend(t1, t2, 0.3)
-	h_tr = trend(h1, h2, 1.0)
-	p_tr = trend(p1, p2, 0.3)
 
-	desc = f"Temperatura {t_tr} ({t2} °C), humedad {h_tr} ({h2} %), presión {p_tr} ({p2} hPa)."
-	return desc
+def describe_trend(historial):
+	"""Genera una descripción simple basada en los últimos puntos del snapshot."""
+	temp = historial['temp']
+	if len(temp) < 2:
+		return "Recopilando datos..."
+
+	# Los dos últimos puntos del mismo snapshot que se acaba de dibujar,
+	# así el texto y la gráfica nunca se contradicen
+	hum, pres = historial['hum'], historial['pres']
+	t1, h1, p1 = float(temp[-2]), float(hum[-2]), float(pres[-2])
+	t2, h2, p2 = float(temp[-1]), float(hum[-1]), float(pres[-1])
+
+	# Entradas cuantizadas a un decimal: pares repetidos pegan en la caché
+	t_tr = _tendencia(round(t1, 1), round(t2, 1), 0.3)
+	h_tr = _tendencia(round(h1, 1), round(h2, 1), 1.0)
+	p_tr = _tendencia(round(p1, 1), round(p2, 1), 0.3)
+
+	return _texto_tendencia(t_tr, h_tr, p_tr, t2, h2, p2)
 
 
 def ejecutar_gui(compartido, evento_parada):
@@ -154,73 +420,137 @@ def ejecutar_gui(compartido, evento_parada):
 	colors = {'temp': 'red', 'hum': 'blue', 'pres': 'green'}
 	yranges = {'temp': (-20, 50), 'hum': (0, 100), 'pres': (900, 1050)}
 
-	def draw():
-		historial = obtener_historial(compartido)
-		canvas.delete("all")
-		if not historial:
-			canvas.create_text(width/2, height/2, text="Esperando datos", fill="gray")
-			return
-
+	# Elementos del canvas creados una sola vez; cada frame solo mueve las
+	# polilíneas con coords() y cambia textos con itemconfigure(), sin
+	# delete("all") ni reconstruir la display list de Tk.
+	usar_raster = USAR_RASTER and Image is not None
+
+	if usar_raster:
+		# Backend raster: el frame completo se compone en un buffer RGB con
+		# PIL y se sube al canvas con un único blit, así el tráfico Tcl por
+		# frame es constante sin importar cuántos puntos tenga la gráfica.
+		fondo = Image.new("RGB", (width, height), "white")
+		pincel_fondo = ImageDraw.Draw(fondo)
 		for i in range(1, 10):
 			y = i * height / 10
-			canvas.create_line(0, y, width, y, fill="#f0f0f0")
-
-		times = [t for (t, _, _, _) in historial]
-		temps = [v for (_, v, _, _) in historial]
-		hums = [v for (_, _, v, _) in historial]
-		press = [v for (_, _, _, v) in historial]
-
-		def plot(series, yrange, color):
-			if not series:
-				return
-			miny, maxy = yrange
-			if miny == maxy:
-				miny -= 1
-				maxy += 1
-			n = len(series)
-			if n < 2:
-				return
-			xs = [i * (width-60) / (n-1) + 30 for i in range(n)]
-			ys = [height - 30 - ((val - miny) * (height-60) / (maxy-miny)) for val in series]
-			pts = []
-			for x, y in zip(xs, ys):
-				pts.extend([x, y])
-			canvas.create_line(*pts, fill=color, width=2, smooth=True)
-			canvas.create_text(width-50, ys[-1], text=str(series[-1]), fill=color, anchor="w")
-
-		def dynamic_range(values, default_range, margin_frac=0.1):
-			if not values:
-				return default_range
-			mn = min(values)
-			mx = max(values)
-			if mn == mx:
-				mn -= 1
-				mx += 1
-			rng = mx - mn
-			mn -= rng * margin_frac
-			mx += rng * margin_frac
-			return (mn, mx)
-
-		t_range = dynamic_range(temps, yranges['temp'])
-		h_range = dynamic_range(hums, yranges['hum'])
-		p_range = dynamic_range(press, yranges['pres'])
-
-		plot(temps, t_range, colors['temp'])
-		plot(hums, h_range, colors['hum'])
-		plot(press, p_range, colors['pres'])
-
-		canvas.create_rectangle(8, 8, 220, 50, fill="#ffffff", outline="#ddd")
-		canvas.create_text(20, 18, text="Temperatura (°C)", fill=colors['temp'], anchor="w")
-		canvas.create_text(20, 32, text="Humedad (%)", fill=colors['hum'], anchor="w")
-		canvas.create_text(140, 18, text="Presion (hPa)", fill=colors['pres'], anchor="w")
+			pincel_fondo.line((0, y, width, y), fill="#f0f0f0")
+		pincel_fondo.rectangle((8, 8, 220, 50), fill="#ffffff", outline="#dddddd")
+		pincel_fondo.text((20, 12), "Temperatura (°C)", fill=colors['temp'])
+		pincel_fondo.text((20, 26), "Humedad (%)", fill=colors['hum'])
+		pincel_fondo.text((140, 12), "Presion (hPa)", fill=colors['pres'])
+
+		frame = fondo.copy() # Buffer de composición reutilizado cada frame
+		# El primer frame muestra el texto de espera; update_loop no llama a
+		# draw() hasta que exista al menos una muestra, así que basta con
+		# hornearlo aquí una sola vez
+		ImageDraw.Draw(frame).text(
+			(width / 2 - 40, height / 2), "Esperando datos", fill="gray")
+		foto = ImageTk.PhotoImage(frame)
+		canvas.create_image(0, 0, anchor="nw", image=foto)
+
+		def draw(historial):
+			frame.paste(fondo) # Limpia el frame con el fondo estático prerrenderizado
+			pincel = ImageDraw.Draw(frame)
+			for clave in ('temp', 'hum', 'pres'):
+				series = historial[clave]
+				n = len(series)
+				if n < 2:
+					continue
+				miny, maxy = _rango_dinamico(series, yranges[clave])
+				# Coordenadas x,y intercaladas calculadas en el kernel nativo
+				pts = np.empty(2 * n)
+				_calcular_xy(series, float(width), float(height), float(miny), float(maxy), pts)
+				xy = pts.tolist()
+				pincel.line(list(zip(xy[0::2], xy[1::2])), fill=colors[clave], width=2)
+				pincel.text((width - 50, pts[-1]), str(series[-1]), fill=colors[clave])
+			foto.paste(frame) # Un solo blit por frame hacia Tk
+
+	else:
+		items = {}
+
+		def dibujar_fondo():
+			# Rejilla y leyenda: se dibujan una sola vez al arrancar, con la
+			# etiqueta "static" para que ningún refresco las toque jamás
+			for i in range(1, 10):
+				y = i * height / 10
+				canvas.create_line(0, y, width, y, fill="#f0f0f0", tags="static")
+			canvas.create_rectangle(8, 8, 220, 50, fill="#ffffff", outline="#ddd", tags="static")
+			canvas.create_text(20, 18, text="Temperatura (°C)", fill=colors['temp'], anchor="w", tags="static")
+			canvas.create_text(20, 32, text="Humedad (%)", fill=colors['hum'], anchor="w", tags="static")
+			canvas.create_text(140, 18, text="Presion (hPa)", fill=colors['pres'], anchor="w", tags="static")
+
+		dibujar_fondo()
+
+		items['espera'] = canvas.create_text(width/2, height/2, text="Esperando datos", fill="gray")
+		for clave in ('temp', 'hum', 'pres'):
+			items[clave] = canvas.create_line(0, 0, 0, 0, fill=colors[clave], width=2, state=tk.HIDDEN)
+			items[clave + '_val'] = canvas.create_text(0, 0, text="", fill=colors[clave], anchor="w", state=tk.HIDDEN)
+
+		# Último valor enviado a cada item: itemconfigure solo cuando algo cambia,
+		# para no mandar comandos Tcl que no modifican nada
+		estado_items = {}
+
+		def draw(historial):
+			if len(historial['temp']) == 0:
+				return # El texto "Esperando datos" sigue visible
+
+			if estado_items.get('espera') != tk.HIDDEN:
+				canvas.itemconfigure(items['espera'], state=tk.HIDDEN)
+				estado_items['espera'] = tk.HIDDEN
+
+			def plot(series, yrange, clave):
+				n = len(series)
+				if n < 2:
+					return
+				miny, maxy = yrange
+				# Coordenadas x,y intercaladas calculadas en el kernel nativo
+				pts = np.empty(2 * n)
+				_calcular_xy(series, float(width), float(height), float(miny), float(maxy), pts)
+				canvas.coords(items[clave], *pts.tolist())
+				# El suavizado le cuesta splines a Tk: solo con pocos puntos
+				suave = (n <= 100)
+				if estado_items.get(clave) != suave:
+					canvas.itemconfigure(items[clave], state=tk.NORMAL, smooth=suave)
+					estado_items[clave] = suave
+				canvas.coords(items[clave + '_val'], width - 50, pts[-1])
+				texto = str(series[-1])
+				if estado_items.get(clave + '_val') != texto:
+					canvas.itemconfigure(items[clave + '_val'], text=texto, state=tk.NORMAL)
+					estado_items[clave + '_val'] = texto
+
+			for clave in ('temp', 'hum', 'pres'):
+				series = historial[clave]
+				plot(series, _rango_dinamico(series, yranges[clave]), clave)
+
+	ultimo_ts_dibujado = None # Timestamp de la última muestra ya dibujada
+	ultimo_desc = None # Último texto enviado al StringVar
 
 	def update_loop():
-		draw()
+		nonlocal ultimo_ts_dibujado, ultimo_desc
+		if root.state() == 'iconic' or not canvas.winfo_viewable():
+			# Ventana minimizada o sin mapear: no componer frames que
+			# nadie verá; al restaurar, el siguiente tick redibuja
+			if not evento_parada.is_set():
+				root.after(1000, update_loop)
+			return
+		muestra = ultima(compartido)
+		ts = muestra[0] if muestra is not None else None
+		if ts == ultimo_ts_dibujado:
+			# Sin muestra nueva: ni copia del historial ni redibujo,
+			# solo volver a mirar pronto
+			if not evento_parada.is_set():
+				root.after(250, update_loop)
+			return
+		# Un solo snapshot por frame, compartido por la gráfica y el texto
 		hist = obtener_historial(compartido)
+		draw(hist)
 		desc = describe_trend(hist)
-		desc_var.set(desc)
+		if desc != ultimo_desc: # set() dispara traces y relayout aunque no cambie nada
+			desc_var.set(desc)
+			ultimo_desc = desc
+		ultimo_ts_dibujado = ts
 		if not evento_parada.is_set():
-			root.after(1000, update_loop)
+			root.after(500, update_loop)
 
 	update_loop()
 	root.mainloop()